@@ -1,13 +1,28 @@
 import os
+import json
 import time
 import base64
-import requests
 from dotenv import load_dotenv
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives import serialization
+from kalshi_connection import SESSION, parse_json, sign_message
 
 load_dotenv()
 
+# Optional list of tickers to scan, e.g. ["BTC-26FEB19-T66500", ...]
+TICKERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tickers.json")
+
+
+def load_tickers(default):
+    """Read the ticker list from tickers.json once, falling back to default."""
+    try:
+        with open(TICKERS_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except Exception as e:
+        print(f"⚠️ Could not read {TICKERS_FILE}: {e}")
+        return default
+
 class KalshiArbScanner:
     def __init__(self):
         self.api_key_id = os.getenv("KALSHI_API_KEY_ID")
@@ -18,15 +33,11 @@ class KalshiArbScanner:
             self.private_key = serialization.load_pem_private_key(f.read(), password=None)
 
     def sign_msg(self, message):
-        signature = self.private_key.sign(
-            message.encode('utf-8'),
-            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-            hashes.SHA256()
-        )
+        signature = sign_message(self.private_key, message.encode('utf-8'))
         return base64.b64encode(signature).decode('utf-8')
 
     def get_headers(self, method, path):
-        timestamp = str(int(time.time() * 1000))
+        timestamp = str(time.time_ns() // 1_000_000)
         msg = timestamp + method + path
         return {
             "KALSHI-ACCESS-KEY": self.api_key_id,
@@ -35,12 +46,19 @@ class KalshiArbScanner:
             "Content-Type": "application/json"
         }
 
-    def scan_market(self, ticker):
+    def fetch_orderbook(self, ticker):
         path = f"/trade-api/v2/markets/{ticker}/orderbook"
+        return SESSION.get(self.base_url + path, headers=self.get_headers("GET", path), timeout=5)
+
+    def fetch_markets(self, tickers):
+        path = "/trade-api/v2/markets?tickers=" + ",".join(tickers)
+        return SESSION.get(self.base_url + path, headers=self.get_headers("GET", path), timeout=5)
+
+    def scan_market(self, ticker):
         try:
-            res = requests.get(self.base_url + path, headers=self.get_headers("GET", path))
+            res = self.fetch_orderbook(ticker)
             if res.status_code == 200:
-                ob = res.json().get('orderbook', {})
+                ob = parse_json(res.content).get('orderbook', {})
                 yes_side = ob.get('yes')
                 no_side = ob.get('no')
 
@@ -50,35 +68,57 @@ class KalshiArbScanner:
 
                 # Best Bid for Yes is the last item in the 'yes' list
                 # Best Bid for No is the last item in the 'no' list
-                best_yes_bid = yes_side[-1][0]
-                best_no_bid = no_side[-1][0]
-                
-                # Math: Cost to buy both sides
-                yes_cost = (100 - best_no_bid) / 100
-                no_cost = (100 - best_yes_bid) / 100
-                total_cost = yes_cost + no_cost
-                
-                print(f"\n📊 TICKER: {ticker}")
-                print(f"Combined Cost: ${total_cost:.2f}")
-
-                if total_cost < 1.00:
-                    print(f"🚀 ARBITRAGE! Profit: ${1.00 - total_cost:.2f}")
-                else:
-                    print(f"❌ Cost is ${total_cost:.2f} (No Arb)")
+                self.report_arb(ticker, yes_side[-1][0], no_side[-1][0])
             else:
                 print(f"❌ Error {res.status_code} for {ticker}")
         except Exception as e:
             print(f"❌ Script Error: {e}")
 
+    def scan_markets(self, tickers):
+        """Scan many tickers with one /markets request using each market's top-of-book bids."""
+        if not tickers:
+            return
+        try:
+            res = self.fetch_markets(tickers)
+            if res.status_code != 200:
+                print(f"❌ Error {res.status_code} for {', '.join(tickers)}")
+                return
+            # Reduce each market to plain (yes_bid, no_bid) ints up front
+            books = {
+                m.get('ticker'): (m.get('yes_bid') or 0, m.get('no_bid') or 0)
+                for m in parse_json(res.content).get('markets', [])
+            }
+            for ticker in tickers:
+                yes_bid, no_bid = books.get(ticker, (0, 0))
+                if not yes_bid or not no_bid:
+                    print(f"⚠️ {ticker}: No active bids/asks found.")
+                    continue
+                self.report_arb(ticker, yes_bid, no_bid)
+        except Exception as e:
+            print(f"❌ Script Error: {e}")
+
+    def report_arb(self, ticker, best_yes_bid, best_no_bid):
+        # Math: Cost to buy both sides, (100 - no_bid) + (100 - yes_bid),
+        # kept in integer cents so the < $1.00 check is exact
+        total_cents = 200 - best_yes_bid - best_no_bid
+
+        print(f"\n📊 TICKER: {ticker}")
+        print(f"Combined Cost: ${total_cents / 100:.2f}")
+
+        if total_cents < 100:
+            print(f"🚀 ARBITRAGE! Profit: ${(100 - total_cents) / 100:.2f}")
+        else:
+            print(f"❌ Cost is ${total_cents / 100:.2f} (No Arb)")
+
 if __name__ == "__main__":
     scanner = KalshiArbScanner()
     # Updated tickers based on your current screen
     # Note: Ticker strings usually follow a pattern. 
     # Check the URL of the specific '66,500 or above' market for the exact ID.
-    active_tickers = [
+    # Put the current tickers in tickers.json to scan without editing this file
+    active_tickers = load_tickers([
         "BTC-26FEB19-T66500", 
         "NDX-26FEB19-T24850"
-    ] 
+    ])
     
-    for t in active_tickers:
-        scanner.scan_market(t)
\ No newline at end of file
+    scanner.scan_markets(active_tickers)
\ No newline at end of file
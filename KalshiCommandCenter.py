@@ -5,21 +5,36 @@ Manages bots, shows live balance, scanner opportunities, and logs.
 """
 import os
 import sys
+import math
+import select
 import time
+import random
+import signal
+import asyncio
+import threading
 import subprocess
-import requests
-from datetime import datetime
+from functools import partial
 from dotenv import load_dotenv
 from textual.app import App, ComposeResult
 from textual.widgets import Header, Footer, Static, Button, Log, Label, DataTable
 from textual.containers import Horizontal, Vertical, ScrollableContainer
-from kalshi_connection import get_kalshi_headers
+from textual.worker import get_current_worker
+from kalshi_connection import SESSION, get_kalshi_headers, parse_balance
 from bot_state import load_state, save_state
 from market_discovery import find_opportunities
 
 load_dotenv()
 
 BASE_URL = os.getenv("KALSHI_BASE_URL", "https://api.elections.kalshi.com")
+BALANCE_PATH = "/trade-api/v2/portfolio/balance"
+BALANCE_URL = BASE_URL + BALANCE_PATH
+# Balance poll period; doubles on each failed sync up to the cap, plus up
+# to BALANCE_JITTER seconds so retries don't line up with other clients
+BALANCE_INTERVAL = 10
+BALANCE_MAX_BACKOFF = 300
+BALANCE_JITTER = 1.0
+_BALANCE_PANEL_FMT = "💰 Kalshi Balance: ${:.2f}".format
+_BALANCE_LOG_FMT = "Balance synced: ${:.2f}".format
 
 BOT_SCRIPTS = {
     "scanner":         "KalshiScanner.py",
@@ -32,6 +47,13 @@ BOT_SCRIPTS = {
     "flipper":         "flipper.py",
 }
 
+# Lines kept per Log widget; older lines are dropped so long sessions stay bounded
+LOG_MAX_LINES = 2000
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_SCRIPT_PATHS = {k: os.path.join(_HERE, v) for k, v in BOT_SCRIPTS.items()}
+_LOG_PATHS = {k: _SCRIPT_PATHS[k][:-3] + ".log" for k in BOT_SCRIPTS}
+
 BOT_LABELS = {
     "scanner":       "📡 Scanner",
     "credit_spread": "📈 Credit Spread",
@@ -43,6 +65,35 @@ BOT_LABELS = {
     "flipper":       "🔄 Flipper",
 }
 
+# Opportunity table columns as (label, key); rows are keyed by rank
+OPP_COLUMNS = (
+    ("Ticker", "ticker"),
+    ("Gap", "gap"),
+    ("Best Side", "side"),
+    ("Ask", "ask"),
+    ("Mins Left", "mins"),
+)
+
+# (key, start label, stop label) for the bot control buttons, built once
+BOT_BUTTON_SPECS = [(key, BOT_LABELS[key], f"Stop {key}") for key in BOT_SCRIPTS]
+
+
+def _wait_proc(proc: subprocess.Popen, timeout: float):
+    """proc.wait(timeout) that blocks on a pidfd (Linux) instead of sleep-polling."""
+    if proc.poll() is not None:
+        return proc.returncode
+    try:
+        fd = os.pidfd_open(proc.pid)
+    except (AttributeError, OSError):
+        return proc.wait(timeout=timeout)
+    try:
+        # The pidfd turns readable once the process exits
+        if not select.select([fd], [], [], timeout)[0]:
+            raise subprocess.TimeoutExpired(proc.args, timeout)
+    finally:
+        os.close(fd)
+    return proc.wait()
+
 
 class KalshiCommandCenter(App):
     """Kalshi Command Center — bot management + live scanner."""
@@ -85,7 +136,21 @@ class KalshiCommandCenter(App):
     #opp-table { height: 10; }
     """
 
+    def __init__(self, minimal: bool = False):
+        super().__init__()
+        # Minimal layout: balance, bot status and log only (no opportunities/scanner feed)
+        self.minimal = minimal
+        # log_msg reformats the timestamp only when the second changes
+        self._log_sec = 0
+        self._log_ts = ""
+        # Lines queued by log_msg, written to the main log in one batch
+        self._log_buf: list[str] = []
+        self._log_flush_timer = None
+
     def compose(self) -> ComposeResult:
+        if self.minimal:
+            yield from self._compose_minimal()
+            return
         yield Header(show_clock=True)
         yield Static("💰 Connecting…", id="header-bar")
         yield Static("j/k: ↑↓ | h/l: ←→ | g/G: top/bottom | Enter: Select | q: Quit", id="help-bar")
@@ -94,9 +159,9 @@ class KalshiCommandCenter(App):
             # LEFT: Bot controls
             with Vertical(id="left-panel", classes="panel"):
                 yield Label("🤖 BOT CONTROLS", classes="panel-title")
-                for key in BOT_SCRIPTS:
-                    yield Button(BOT_LABELS[key], id=f"start_{key}", classes="start")
-                    yield Button(f"Stop {key}", id=f"stop_{key}", classes="stop")
+                for key, start_label, stop_label in BOT_BUTTON_SPECS:
+                    yield Button(start_label, id=f"start_{key}", classes="start")
+                    yield Button(stop_label, id=f"stop_{key}", classes="stop")
                 yield Label(" ", classes="panel-title")
                 yield Button("⛔ Stop All", id="btn_stop_all", classes="stop")
                 yield Button("🔄 Refresh", id="btn_refresh", classes="action")
@@ -108,19 +173,36 @@ class KalshiCommandCenter(App):
                 yield Label("🎯 LIVE OPPORTUNITIES", classes="panel-title")
                 yield DataTable(id="opp_table")
                 yield Label("📋 LOG", classes="panel-title")
-                yield Log(id="main_log")
+                yield Log(id="main_log", max_lines=LOG_MAX_LINES)
 
             # RIGHT: Scanner state
             with Vertical(id="right-panel", classes="panel"):
                 yield Label("📡 SCANNER FEED", classes="panel-title")
-                yield Log(id="scanner_log")
+                yield Log(id="scanner_log", max_lines=LOG_MAX_LINES)
 
         yield Static("Initializing…", id="init-status")
         yield Footer()
 
+    def _compose_minimal(self) -> ComposeResult:
+        yield Header(show_clock=True)
+        yield Static("💰 Connecting…", id="header-bar")
+        with Horizontal():
+            with Vertical(id="left-panel", classes="panel"):
+                yield Label("🚀 ACTIONS", classes="panel-title")
+                yield Button("🔄 Refresh", id="btn_refresh", classes="action")
+            with Vertical(id="center-panel", classes="panel"):
+                yield Label("📋 LOG", classes="panel-title")
+                yield Log(id="main_log", max_lines=LOG_MAX_LINES)
+        yield Footer()
+
     def on_mount(self) -> None:
         self.python_exe = sys.executable
         self.bots: dict[str, subprocess.Popen] = {}
+        self._bot_alive: dict[str, bool] = {}
+        self._log_offsets: dict[str, int] = {}
+        self._log_fds: dict[str, int] = {}
+        self._log_wakeup = threading.Event()
+        self._tailing = True
         
         # Set up Vim key bindings
         self.bind("j", "cursor_down")
@@ -132,109 +214,209 @@ class KalshiCommandCenter(App):
         self.bind("q", "quit")
         self.bind("ctrl+c", "quit")
 
+        # Every button id maps straight to its handler
+        self._btn_actions = {"btn_refresh": self._manual_refresh}
+
+        # Widgets the handlers touch, looked up once instead of per call
+        self._main_log = self.query_one("#main_log", Log)
+        self._header_bar = self.query_one("#header-bar", Static)
+
+        self.log_msg("Command Center online.")
+
+        self._state_dirty = False
+        self._flush_timer = None
+        # The minimal wallet view is read-only: no bot controls, tables or restore
+        if not self.minimal:
+            self._mount_bot_controls()
+
+        # Balance/opportunity polling; Refresh sets _poll_now to sync immediately
+        self._poll_now = asyncio.Event()
+        self.run_worker(self._poller(), group="poller")
+
+    def _mount_bot_controls(self) -> None:
+        """Full-layout setup: bot buttons, tables, bot restore, log tailing and reaping."""
+        self._btn_actions["btn_refresh"] = self._refresh_with_bots
+        self._btn_actions["btn_stop_all"] = self.stop_all_bots
+        for key in BOT_SCRIPTS:
+            self._btn_actions[f"start_{key}"] = partial(self.start_bot, key)
+            self._btn_actions[f"stop_{key}"] = partial(self.stop_bot, key)
+
+        self._bots_table = self.query_one("#bots_table", DataTable)
+        self._opp_table = self.query_one("#opp_table", DataTable)
+        self._scanner_log = self.query_one("#scanner_log", Log)
+
         # Init bots table
-        bt = self.query_one("#bots_table", DataTable)
-        bt.add_columns("Bot", "Status", "PID")
-        
-        # Add initial data
-        for key, script in BOT_SCRIPTS.items():
-            bt.add_row(BOT_LABELS[key], "Stopped", "-")
+        bt = self._bots_table
+        bt.add_column("Bot", key="bot")
+        bt.add_column("Status", key="status")
+        bt.add_column("PID", key="pid")
+
+        # One row per bot, keyed by bot key so later refreshes update in place
+        self._bot_last_status: dict[str, tuple[str, str]] = {}
+        for key in BOT_SCRIPTS:
+            bt.add_row(BOT_LABELS[key], "Stopped", "-", key=key)
 
         # Init opportunities table
-        ot = self.query_one("#opp_table", DataTable)
-        ot.add_columns("Ticker", "Gap", "Best Side", "Ask", "Mins Left")
-        
+        ot = self._opp_table
+        for label, col_key in OPP_COLUMNS:
+            ot.add_column(label, key=col_key)
+
         # Add sample data
-        ot.add_row("KXETH15M-26FEB191215", "3¢", "YES", "48¢", "15")
+        self._opp_rows: list[tuple[str, ...]] = []
+        self._set_opp_rows([("KXETH15M-26FEB191215", "3¢", "YES", "48¢", "15")])
 
-        self.log_msg("Command Center online.")
-        self.update_bots_table()
-        
         # Update the init status to show we're ready
         self.query_one("#init-status", Static).update("Ready - Use j/k/h/l to navigate")
 
-        # Restore previously running bots
-        for key, running in load_state().items():
+        # Restore previously running bots: spawn them all, then refresh once
+        self._state = load_state()
+        for key, running in list(self._state.items()):
             if running and key in BOT_SCRIPTS:
                 self.log_msg(f"🔁 Restoring: {key}")
-                self.start_bot(key)
+                self._start_bot_nopersist(key)
+        self.update_bots_table()
 
-        # Timers
-        self.set_interval(5,  self.update_bots_table)
-        self.set_interval(10, self._refresh_balance)
-        self.set_interval(15, self._refresh_opportunities)
-        self._refresh_balance()
-        self._refresh_opportunities()
+        # One thread tails every bot log
+        self.run_worker(self._tail_bot_logs, thread=True)
 
-    # ── Balance ──────────────────────────────────────────────────────────
+        # Exited bots are noticed on SIGCHLD instead of polling every child
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGCHLD, self._reap_children)
+        except (AttributeError, NotImplementedError, RuntimeError):
+            # No SIGCHLD (e.g. Windows): poll the children on a timer instead
+            self.set_interval(5, self._reap_children)
+
+    # ── Polling ───────────────────────────────────────────────────────────
+
+    async def _poller(self):
+        """Poll balance (every 10s, backing off on errors) and opportunities (every 15s) from one task."""
+        loop = asyncio.get_running_loop()
+        # The minimal layout has no opportunities table, so that job never comes due
+        poll_opps = not self.minimal
+        next_balance = loop.time()
+        next_opps = next_balance if poll_opps else math.inf
+        balance_delay = BALANCE_INTERVAL
+        while True:
+            now = loop.time()
+            jobs = []
+            balance_due = now >= next_balance
+            if balance_due:
+                jobs.append(self._sync_balance())
+            if now >= next_opps:
+                jobs.append(self._sync_opportunities())
+                next_opps = now + 15
+            results = await asyncio.gather(*jobs)
+            if balance_due:
+                if results[0]:
+                    balance_delay = BALANCE_INTERVAL
+                else:
+                    balance_delay = min(balance_delay * 2, BALANCE_MAX_BACKOFF)
+                next_balance = now + balance_delay + random.uniform(0, BALANCE_JITTER)
+            try:
+                await asyncio.wait_for(
+                    self._poll_now.wait(),
+                    max(0.0, min(next_balance, next_opps) - loop.time()),
+                )
+            except asyncio.TimeoutError:
+                continue
+            self._poll_now.clear()
+            next_balance = loop.time()
+            if poll_opps:
+                next_opps = next_balance
 
-    def _refresh_balance(self):
-        self.run_worker(self._fetch_balance, thread=True)
+    # ── Balance ──────────────────────────────────────────────────────────
 
     def _fetch_balance(self):
+        return SESSION.get(
+            BALANCE_URL,
+            headers=get_kalshi_headers("GET", BALANCE_PATH),
+            # (connect, read): fail fast when the host is unreachable
+            timeout=(2, 5),
+        )
+
+    async def _sync_balance(self) -> bool:
+        """Fetch and show the balance; returns False if the sync failed."""
         try:
-            path = "/trade-api/v2/portfolio/balance"
-            res = requests.get(
-                BASE_URL + path,
-                headers=get_kalshi_headers("GET", path),
-                timeout=5,
-            )
+            # requests is blocking, so the call runs on the loop's executor threads
+            res = await asyncio.to_thread(self._fetch_balance)
             if res.status_code == 200:
-                bal = res.json().get("balance", 0) / 100
-                self.call_from_thread(
-                    self.query_one("#header-bar", Static).update,
-                    f"💰 Kalshi Balance: ${bal:.2f}",
-                )
-                self.call_from_thread(self.log_msg, f"Balance synced: ${bal:.2f}")
-            else:
-                self.call_from_thread(self.log_msg, f"⚠️ Balance API {res.status_code}")
+                bal = parse_balance(res.content)
+                self._header_bar.update(_BALANCE_PANEL_FMT(bal))
+                self.log_msg(_BALANCE_LOG_FMT(bal))
+                return True
+            self.log_msg(f"⚠️ Balance API {res.status_code}")
         except Exception as e:
-            self.call_from_thread(self.log_msg, f"Balance error: {e}")
+            self.log_msg(f"Balance error: {e}")
+        return False
 
     # ── Opportunities ─────────────────────────────────────────────────────
 
-    def _refresh_opportunities(self):
-        self.run_worker(self._fetch_opportunities, thread=True)
-
-    def _fetch_opportunities(self):
+    async def _sync_opportunities(self):
         try:
-            opps = find_opportunities(min_gap=2, max_ask=50)
-            self.call_from_thread(self._update_opp_table, opps)
+            opps = await asyncio.to_thread(find_opportunities, min_gap=2, max_ask=50)
+            self._update_opp_table(opps)
             if opps:
                 top = opps[0]
-                self.call_from_thread(
-                    self.log_msg,
+                self.log_msg(
                     f"🎯 Best opp: {top['ticker']} gap={top['_gap']}¢ {top['_best_side']}@{top['_best_ask']}¢",
                 )
         except Exception as e:
-            self.call_from_thread(self.log_msg, f"Opp scan error: {e}")
+            self.log_msg(f"Opp scan error: {e}")
 
     def _update_opp_table(self, opps: list):
-        ot = self.query_one("#opp_table", DataTable)
-        ot.clear()
-        for o in opps[:8]:
-            ot.add_row(
+        self._set_opp_rows([
+            (
                 o["ticker"][-25:],
                 f"{o['_gap']}¢",
                 o["_best_side"].upper(),
                 f"{o['_best_ask']}¢",
                 str(o["_mins_left"]) if o["_mins_left"] is not None else "?",
             )
+            for o in opps[:8]
+        ])
+
+    def _set_opp_rows(self, rows: list[tuple[str, ...]]):
+        """Diff rows against the last render: update changed cells, add/remove only the tail."""
+        ot = self._opp_table
+        last = self._opp_rows
+        for i, row in enumerate(rows):
+            if i >= len(last):
+                ot.add_row(*row, key=str(i))
+            elif row != last[i]:
+                for (_, col_key), old, new in zip(OPP_COLUMNS, last[i], row):
+                    if old != new:
+                        ot.update_cell(str(i), col_key, new)
+        for i in range(len(rows), len(last)):
+            ot.remove_row(str(i))
+        self._opp_rows = rows
 
     # ── Bots table ────────────────────────────────────────────────────────
 
     def update_bots_table(self):
-        bt = self.query_one("#bots_table", DataTable)
-        bt.clear()
-        for key, script in BOT_SCRIPTS.items():
+        """Refresh only the rows whose status or PID changed."""
+        bt = self._bots_table
+        for key in BOT_SCRIPTS:
             proc = self.bots.get(key)
-            if proc and proc.poll() is None:
+            if proc and self._bot_alive.get(key):
                 status = "🟢 running"
                 pid = str(proc.pid)
             else:
                 status = "⚫ stopped"
                 pid = "—"
-            bt.add_row(BOT_LABELS[key], status, pid)
+            if self._bot_last_status.get(key) == (status, pid):
+                continue
+            self._bot_last_status[key] = (status, pid)
+            bt.update_cell(key, "status", status)
+            bt.update_cell(key, "pid", pid)
+
+    def _reap_children(self):
+        """Mark bots whose process has exited as dead and refresh the table."""
+        for key, proc in list(self.bots.items()):
+            if self._bot_alive.get(key) and proc.poll() is not None:
+                self._bot_alive[key] = False
+                self.log_msg(f"⚠️ {key} exited (code {proc.returncode})")
+        self.update_bots_table()
+        self._log_wakeup.set()
 
     # ── Bot lifecycle ─────────────────────────────────────────────────────
 
@@ -242,103 +424,199 @@ class KalshiCommandCenter(App):
         if key not in BOT_SCRIPTS:
             return
         proc = self.bots.get(key)
-        if proc and proc.poll() is None:
+        if proc and self._bot_alive.get(key):
             self.log_msg(f"⚠️ {key} already running (PID {proc.pid})")
             return
+        if self._start_bot_nopersist(key):
+            self.update_bots_table()
+            self._log_wakeup.set()
+            self._set_bot_state(key, True)
 
+    def _start_bot_nopersist(self, key: str) -> bool:
+        """Spawn a bot and track it, without touching the table or saved state."""
         script = BOT_SCRIPTS[key]
-        script_path = os.path.join(os.path.dirname(__file__), script)
-        log_path = script.replace(".py", ".log")
+        log_path = _LOG_PATHS[key]
         try:
-            with open(log_path, "a") as lf:
+            # Raw append fd: the child gets its own dup, so ours is closed right after spawning
+            log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                log_offset = os.fstat(log_fd).st_size
                 proc = subprocess.Popen(
-                    [self.python_exe, script_path],
-                    stdout=lf, stderr=lf,
-                    cwd=os.path.dirname(__file__),
+                    [self.python_exe, _SCRIPT_PATHS[key]],
+                    # No stdin: the TUI owns the terminal
+                    stdin=subprocess.DEVNULL, stdout=log_fd, stderr=log_fd,
+                    cwd=_HERE,
+                    # Own session: Ctrl+C in the TUI doesn't hit the bots
+                    start_new_session=True,
+                    close_fds=True,
                 )
+            finally:
+                os.close(log_fd)
             self.bots[key] = proc
+            self._bot_alive[key] = True
+            self._log_offsets[key] = log_offset
             self.log_msg(f"🚀 Started {script} (PID {proc.pid})")
-            self.update_bots_table()
-            self.run_worker(lambda k=key: self._tail_bot_log(k), thread=True)
-            st = load_state(); st[key] = True; save_state(st)
+            return True
         except Exception as e:
             self.log_msg(f"❌ Failed to start {key}: {e}")
+            return False
 
     def stop_bot(self, key: str):
-        proc = self.bots.pop(key, None)
-        if not proc:
+        if key not in self.bots:
             self.log_msg(f"⚠️ {key} not running")
             return
-        try:
-            proc.terminate()
-            proc.wait(timeout=5)
-            self.log_msg(f"🛑 Stopped {key} (PID {proc.pid})")
-        except Exception:
-            try:
-                proc.kill()
-                self.log_msg(f"💀 Killed {key}")
-            except Exception as e:
-                self.log_msg(f"❌ Kill failed: {e}")
-        self.update_bots_table()
-        st = load_state(); st[key] = False; save_state(st)
+        self._stop_bots([key])
 
     def stop_all_bots(self):
         self.log_msg("⛔ Stopping all bots…")
-        for key in list(self.bots.keys()):
-            self.stop_bot(key)
+        self._stop_bots(list(self.bots))
+        self._flush_state()
+
+    def _stop_bots(self, keys: list[str]):
+        """Send every bot SIGTERM in one pass, then wait for them off the event loop."""
+        procs = []
+        for key in keys:
+            proc = self.bots.pop(key)
+            self._bot_alive.pop(key, None)
+            proc.terminate()
+            procs.append((key, proc))
+            self._set_bot_state(key, False)
+        self._log_wakeup.set()
+        self.update_bots_table()
+        self.run_worker(lambda: self._join_or_kill(procs), thread=True, exit_on_error=False)
 
-    def _tail_bot_log(self, key: str):
-        """Tail a bot's log file into the scanner feed."""
-        script = BOT_SCRIPTS[key]
-        log_path = os.path.join(os.path.dirname(__file__), script.replace(".py", ".log"))
-        time.sleep(1)
+    def _join_or_kill(self, procs: list[tuple[str, subprocess.Popen]]):
+        """Wait for terminated bots against one shared 5s deadline; kill any stragglers."""
+        deadline = time.monotonic() + 5
+        for key, proc in procs:
+            try:
+                _wait_proc(proc, max(0.0, deadline - time.monotonic()))
+                self.call_from_thread(self.log_msg, f"🛑 Stopped {key} (PID {proc.pid})")
+            except Exception:
+                try:
+                    proc.kill()
+                    proc.wait()
+                    self.call_from_thread(self.log_msg, f"💀 Killed {key}")
+                except Exception as e:
+                    self.call_from_thread(self.log_msg, f"❌ Kill failed: {e}")
+
+    def _set_bot_state(self, key: str, running: bool):
+        """Record a bot's on/off state and flush it once a burst of changes settles."""
+        self._state[key] = running
+        self._state_dirty = True
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+        self._flush_timer = self.set_timer(0.2, self._flush_state)
+
+    def _flush_state(self):
+        """Persist bot on/off state, only if it changed since the last flush."""
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+            self._flush_timer = None
+        if self._state_dirty:
+            self._state_dirty = False
+            save_state(self._state)
+
+    def _tail_bot_logs(self):
+        """Tail every running bot's log into the scanner feed from one thread."""
+        worker = get_current_worker()
+        while self._tailing and not worker.is_cancelled:
+            lines: list[str] = []
+            for key in list(self._log_offsets):
+                self._drain_bot_log(key, lines)
+                if not self._bot_alive.get(key):
+                    self._log_offsets.pop(key, None)
+                    self._close_log_fd(key)
+            # One hop to the event loop and one widget update per pass
+            if lines:
+                self.call_from_thread(self._append_scanner_log, lines)
+            # Woken early by start/stop so new bots are picked up immediately;
+            # with nothing to tail, sleep until a bot starts instead of ticking
+            self._log_wakeup.wait(1 if self._log_offsets else None)
+            self._log_wakeup.clear()
+
+    def _drain_bot_log(self, key: str, out: list[str]):
+        """Collect into out any lines appended to a bot's log since the last drain."""
         try:
-            last_size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
-            while key in self.bots and self.bots[key].poll() is None:
-                current_size = os.path.getsize(log_path) if os.path.exists(log_path) else 0
-                if current_size > last_size:
-                    with open(log_path, "r", encoding="utf-8") as f:
-                        f.seek(last_size)
-                        for line in f.readlines():
-                            line = line.strip()
-                            if line:
-                                self.call_from_thread(self._append_scanner_log, f"[{key}] {line}")
-                    last_size = current_size
-                time.sleep(2)
+            fd = self._log_fds.get(key)
+            if fd is None:
+                log_path = _LOG_PATHS[key]
+                if not os.path.exists(log_path):
+                    return
+                # Kept open for the bot's lifetime; _log_offsets is the only read cursor
+                fd = self._log_fds[key] = os.open(log_path, os.O_RDONLY)
+            current_size = os.fstat(fd).st_size
+            last_size = self._log_offsets.get(key, 0)
+            if current_size < last_size:
+                last_size = 0  # log was truncated/rotated
+            if current_size > last_size:
+                # pread ignores the fd position, so a restart resetting the offset is safe
+                buf = os.pread(fd, current_size - last_size, last_size)
+                last_size += len(buf)
+                for raw in buf.splitlines():
+                    line = raw.decode("utf-8", "replace").strip()
+                    if line:
+                        out.append(f"[{key}] {line}")
+            self._log_offsets[key] = last_size
         except Exception as e:
             self.call_from_thread(self.log_msg, f"Log tail error ({key}): {e}")
 
-    def _append_scanner_log(self, text: str):
-        self.query_one("#scanner_log", Log).write_line(text)
+    def _close_log_fd(self, key: str):
+        fd = self._log_fds.pop(key, None)
+        if fd is not None:
+            os.close(fd)
+
+    def on_unmount(self) -> None:
+        self._flush_state()
+        self._tailing = False
+        self._log_wakeup.set()
+        for key in list(self._log_fds):
+            self._close_log_fd(key)
+        try:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGCHLD)
+        except (AttributeError, NotImplementedError, RuntimeError):
+            pass
+        # Drop the pooled keep-alive connections along with the app
+        SESSION.close()
+
+    def _append_scanner_log(self, lines: list[str]):
+        self._scanner_log.write_lines(lines)
 
     # ── Logging ───────────────────────────────────────────────────────────
 
     def log_msg(self, msg: str):
-        ts = datetime.now().strftime("%H:%M:%S")
-        full = f"[{ts}] {msg}"
+        sec = int(time.time())
+        if sec != self._log_sec:
+            self._log_sec = sec
+            self._log_ts = time.strftime("%H:%M:%S", time.localtime(sec))
+        self._log_buf.append(f"[{self._log_ts}] {msg}")
+        # Bursts within 0.1s land as a single write_lines/repaint
+        if self._log_flush_timer is None:
+            self._log_flush_timer = self.set_timer(0.1, self._flush_log)
+
+    def _flush_log(self):
+        self._log_flush_timer = None
+        lines, self._log_buf = self._log_buf, []
         try:
-            self.query_one("#main_log", Log).write_line(full)
-            short = msg[:90] if len(msg) > 90 else msg
-            self.query_one("#status-bar", Static).update(f"{ts} {short}")
+            self._main_log.write_lines(lines)
         except Exception:
             pass
 
     # ── Button handler ────────────────────────────────────────────────────
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
-        bid = event.button.id or ""
-        if bid.startswith("start_"):
-            self.start_bot(bid[6:])
-        elif bid.startswith("stop_") and bid != "btn_stop_all":
-            self.stop_bot(bid[5:])
-        elif bid == "btn_stop_all":
-            self.stop_all_bots()
-        elif bid == "btn_refresh":
-            self._refresh_balance()
-            self._refresh_opportunities()
-            self.update_bots_table()
-            self.log_msg("Manual refresh triggered.")
+        action = self._btn_actions.get(event.button.id)
+        if action is not None:
+            action()
+
+    def _manual_refresh(self):
+        self._poll_now.set()
+        self.log_msg("Manual refresh triggered.")
+
+    def _refresh_with_bots(self):
+        self._manual_refresh()
+        self.update_bots_table()
 
 
 if __name__ == "__main__":
-    KalshiCommandCenter().run()
+    KalshiCommandCenter(minimal="--minimal" in sys.argv[1:]).run()
@@ -2,26 +2,35 @@ import os
 import sys
 import time
 import base64
-import requests
 import uuid
 import signal
-import json
 from dotenv import load_dotenv
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from datetime import datetime, timedelta
-from kalshi_connection import get_kalshi_headers
+from kalshi_connection import BASE_URL, SESSION, dump_json, get_kalshi_headers, parse_balance, parse_json
 
 load_dotenv()
 
+ORDERS_PATH = "/trade-api/v2/portfolio/orders"
+ORDERS_URL = BASE_URL + ORDERS_PATH
+BALANCE_PATH = "/trade-api/v2/portfolio/balance"
+BALANCE_URL = BASE_URL + BALANCE_PATH
+SCAN_INTERVAL = 10  # seconds
+
 class KalshiCreditSpreadBot:
     """Headless Credit Spread Trading Bot."""
     
     def __init__(self):
         self.running = True
         self.log_file = "credit_spread_bot.log"
+        self._log_fp = open(self.log_file, "a", buffering=1 << 14, encoding="utf-8")
         self.state_file = "credit_spread_state.json"
         self.active_ticker = "KXETH15M-26FEB191230"
+        self._next_target_ts = None  # epoch seconds of the next :30 mark
+        # The bot polls one fixed market, so its path and URL are built once
+        self._market_path = f"/trade-api/v2/markets/{self.active_ticker}"
+        self._market_url = BASE_URL + self._market_path
         
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -30,6 +39,11 @@ class KalshiCreditSpreadBot:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
         self.log_message(f"Received signal {signum}, shutting down...")
+        # Written now: the parent may kill the bot before the loop's next flush
+        try:
+            self._log_fp.flush()
+        except (OSError, RuntimeError):  # e.g. the signal landed mid-write
+            pass
         self.running = False
         
     def log_message(self, message: str):
@@ -38,8 +52,7 @@ class KalshiCreditSpreadBot:
         log_entry = f"[{timestamp}] {message}\n"
         
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            self._log_fp.write(log_entry)
             print(log_entry.strip())  # Also print to console for debugging
         except Exception as e:
             print(f"Failed to write to log: {e}")
@@ -47,16 +60,16 @@ class KalshiCreditSpreadBot:
     def save_state(self, state_data):
         """Save bot state to file."""
         try:
-            with open(self.state_file, "w") as f:
-                json.dump(state_data, f, indent=2)
+            with open(self.state_file, "wb") as f:
+                f.write(dump_json(state_data, indent=True))
         except Exception as e:
             self.log_message(f"Failed to save state: {e}")
     
     def load_state(self):
         """Load bot state from file."""
         try:
-            with open(self.state_file, "r") as f:
-                return json.load(f)
+            with open(self.state_file, "rb") as f:
+                return parse_json(f.read())
         except:
             return {}
     
@@ -69,9 +82,6 @@ class KalshiCreditSpreadBot:
     
     def place_order(self, count=5):
         """Place a credit spread order."""
-        path = "/trade-api/v2/portfolio/orders"
-        url = "https://api.elections.kalshi.com" + path
-        
         # Using a Limit Order at 99 cents to ensure it fills but doesn't overpay
         payload = {
             "action": "buy",
@@ -84,7 +94,7 @@ class KalshiCreditSpreadBot:
         }
         
         try:
-            res = requests.post(url, json=payload, headers=self.get_kalshi_headers("POST", path))
+            res = SESSION.post(ORDERS_URL, data=dump_json(payload), headers=self.get_kalshi_headers("POST", ORDERS_PATH), timeout=10)
             if res.status_code == 201:
                 self.log_message(f"✅ ORDER PLACED: {count} contracts on {self.active_ticker}")
                 return True
@@ -98,12 +108,9 @@ class KalshiCreditSpreadBot:
     def check_balance(self):
         """Check current account balance."""
         try:
-            b_path = "/trade-api/v2/portfolio/balance"
-            base_url = os.getenv("KALSHI_BASE_URL", "https://api.elections.kalshi.com")
-            url = base_url + b_path
-            res = requests.get(url, headers=get_kalshi_headers("GET", b_path))
+            res = SESSION.get(BALANCE_URL, headers=get_kalshi_headers("GET", BALANCE_PATH), timeout=10)
             if res.status_code == 200:
-                balance = res.json().get('balance', 0) / 100
+                balance = parse_balance(res.content)
                 return balance
         except Exception as e:
             self.log_message(f"Error checking balance: {e}")
@@ -112,22 +119,30 @@ class KalshiCreditSpreadBot:
     def get_market_data(self, ticker):
         """Get market data for a specific ticker."""
         try:
-            url = f"https://api.elections.kalshi.com/trade-api/v2/markets/{ticker}"
-            res = requests.get(url, headers=get_kalshi_headers("GET", f"/trade-api/v2/markets/{ticker}"))
+            if ticker == self.active_ticker:
+                path, url = self._market_path, self._market_url
+            else:
+                path = f"/trade-api/v2/markets/{ticker}"
+                url = BASE_URL + path
+            res = SESSION.get(url, headers=get_kalshi_headers("GET", path), timeout=10)
             if res.status_code == 200:
-                return res.json().get('market', {})
+                return parse_json(res.content).get('market', {})
         except Exception as e:
             self.log_message(f"Error getting market data for {ticker}: {e}")
         return None
     
     def calculate_time_to_expiry(self):
         """Calculate time until next 30-minute mark."""
-        now = datetime.now()
-        target = now.replace(minute=30, second=0, microsecond=0)
-        if now.minute >= 30: 
-            target += timedelta(hours=1)
-        remaining = target - now
-        return f"{remaining.seconds // 60:02d}:{remaining.seconds % 60:02d}"
+        now = time.time()
+        if self._next_target_ts is None or now >= self._next_target_ts:
+            # The target only moves once per hour, so the datetime math runs then
+            dt_now = datetime.fromtimestamp(now)
+            target = dt_now.replace(minute=30, second=0, microsecond=0)
+            if dt_now.minute >= 30:
+                target += timedelta(hours=1)
+            self._next_target_ts = target.timestamp()
+        remaining = int(self._next_target_ts - now)
+        return f"{remaining // 60:02d}:{remaining % 60:02d}"
     
     def scan_opportunities(self):
         """Scan for credit spread opportunities."""
@@ -178,22 +193,18 @@ class KalshiCreditSpreadBot:
         self.log_message(f"PID: {os.getpid()}")
         self.log_message(f"Active ticker: {self.active_ticker}")
         
-        # Initial scan
-        self.scan_opportunities()
-        
-        # Main loop - scan every 10 seconds, update countdown every second
-        countdown_counter = 0
+        # Main loop - scan now, then every 10 seconds; each scan logs the time to expiry
+        next_scan = time.monotonic()
         while self.running:
             try:
-                if countdown_counter % 10 == 0:
+                now = time.monotonic()
+                if now >= next_scan:
                     self.scan_opportunities()
+                    self._log_fp.flush()
+                    next_scan = time.monotonic() + SCAN_INTERVAL
                 else:
-                    # Just update countdown
-                    time_left = self.calculate_time_to_expiry()
-                    self.log_message(f"Time to expiry: {time_left}")
-                
-                time.sleep(1)
-                countdown_counter += 1
+                    # Sleep in chunks of at most 1s so a stop signal is noticed promptly
+                    time.sleep(min(1, next_scan - now))
                 
             except KeyboardInterrupt:
                 break
@@ -202,6 +213,7 @@ class KalshiCreditSpreadBot:
                 time.sleep(5)  # Wait before retrying
         
         self.log_message("Kalshi Credit Spread Bot stopped")
+        self._log_fp.close()
 
 if __name__ == "__main__":
     bot = KalshiCreditSpreadBot()
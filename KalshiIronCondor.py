@@ -2,14 +2,13 @@ import os
 import sys
 import time
 import base64
-import requests
 import signal
 import json
 from dotenv import load_dotenv
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from datetime import datetime
-from kalshi_connection import get_kalshi_headers
+from kalshi_connection import SESSION, get_kalshi_headers, parse_balance, parse_json
 
 load_dotenv()
 
@@ -19,6 +18,7 @@ class KalshiIronCondorBot:
     def __init__(self):
         self.running = True
         self.log_file = "iron_condor_bot.log"
+        self._log_fp = open(self.log_file, "a", buffering=1 << 14, encoding="utf-8")
         self.state_file = "iron_condor_state.json"
         
         # Set up signal handlers for graceful shutdown
@@ -28,6 +28,11 @@ class KalshiIronCondorBot:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
         self.log_message(f"Received signal {signum}, shutting down...")
+        # Written now: the parent may kill the bot before the loop's next flush
+        try:
+            self._log_fp.flush()
+        except (OSError, RuntimeError):  # e.g. the signal landed mid-write
+            pass
         self.running = False
         
     def log_message(self, message: str):
@@ -36,8 +41,7 @@ class KalshiIronCondorBot:
         log_entry = f"[{timestamp}] {message}\n"
         
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            self._log_fp.write(log_entry)
             print(log_entry.strip())  # Also print to console for debugging
         except Exception as e:
             print(f"Failed to write to log: {e}")
@@ -48,9 +52,9 @@ class KalshiIronCondorBot:
             b_path = "/trade-api/v2/portfolio/balance"
             base_url = os.getenv("KALSHI_BASE_URL", "https://api.elections.kalshi.com")
             url = base_url + b_path
-            res = requests.get(url, headers=get_kalshi_headers("GET", b_path))
+            res = SESSION.get(url, headers=get_kalshi_headers("GET", b_path), timeout=10)
             if res.status_code == 200:
-                balance = res.json().get('balance', 0) / 100
+                balance = parse_balance(res.content)
                 return balance
         except Exception as e:
             self.log_message(f"Error checking balance: {e}")
@@ -59,9 +63,9 @@ class KalshiIronCondorBot:
     def get_ticker_details(self, ticker):
         try:
             url = f"https://api.elections.kalshi.com/trade-api/v2/markets/{ticker}"
-            res = requests.get(url, headers=get_kalshi_headers("GET", f"/trade-api/v2/markets/{ticker}"))
+            res = SESSION.get(url, headers=get_kalshi_headers("GET", f"/trade-api/v2/markets/{ticker}"), timeout=10)
             if res.status_code == 200:
-                m = res.json().get('market', {})
+                m = parse_json(res.content).get('market', {})
                 # No cost = 100 - Yes_Price
                 no_cost = 100 - m.get('yes_ask', 0)
                 return m.get('cap', 'N/A'), f"{no_cost}¢", f"{no_cost}%"
@@ -98,6 +102,7 @@ class KalshiIronCondorBot:
         while self.running:
             try:
                 self.monitor_markets()
+                self._log_fp.flush()
                 time.sleep(10)
             except KeyboardInterrupt:
                 break
@@ -106,6 +111,7 @@ class KalshiIronCondorBot:
                 time.sleep(5)  # Wait before retrying
         
         self.log_message("Kalshi Iron Condor Bot stopped")
+        self._log_fp.close()
 
 if __name__ == "__main__":
     bot = KalshiIronCondorBot()
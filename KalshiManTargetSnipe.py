@@ -5,26 +5,41 @@ import base64
 import requests
 import uuid
 import signal
-import json
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+from kalshi_connection import HEADER_TTL, SESSION, dump_json, load_private_key, parse_json, sign_message
 
 load_dotenv()
 
+POLL_INTERVAL = 0.5  # seconds between market polls
+# The order header is pre-signed just before each market poll, so when a
+# trade fires it is one market-list round trip old (bounded by that request's
+# 5s timeout). Reuse it for as long as the shared header cache trusts a
+# signature, which is inside Kalshi's timestamp window; re-sign past that.
+ORDER_HEADER_TTL = HEADER_TTL
+
 class KalshiManTargetSnipeBot:
     """Headless Manual Target Sniper Bot."""
     
     def __init__(self):
         self.running = True
         self.log_file = "man_target_snipe_bot.log"
+        # One handle for the bot's lifetime instead of an open() per message
+        self._log_fp = open(self.log_file, "a", buffering=1 << 14, encoding="utf-8")
         self.state_file = "man_target_snipe_state.json"
         self.api_key_id = os.getenv("KALSHI_API_KEY_ID")
         self.private_key_path = os.getenv("KALSHI_PRIVATE_KEY_PATH")
+        # Parsed once; every request reuses the key instead of re-reading the PEM
+        self._priv_key = load_private_key(self.private_key_path)
         # Switching to the primary trading API for better reliability
         self.base_url = "https://trading-api.kalshi.com" 
         self.active_positions = {}
+        # Everything about an order except ticker/action/count/id is fixed,
+        # so it's built here rather than when a trade fires
+        self._order_path = "/trade-api/v2/portfolio/orders"
+        self._order_url = self.base_url + self._order_path
+        self._order_base = {"type": "market", "side": "yes"}
+        self._order_headers = (float("-inf"), None)  # (monotonic signed_at, headers)
         
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -33,6 +48,11 @@ class KalshiManTargetSnipeBot:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
         self.log_message(f"Received signal {signum}, shutting down...")
+        # Written now: the parent may kill the bot before the loop's next flush
+        try:
+            self._log_fp.flush()
+        except (OSError, RuntimeError):  # e.g. the signal landed mid-write
+            pass
         self.running = False
         
     def log_message(self, message: str):
@@ -41,24 +61,17 @@ class KalshiManTargetSnipeBot:
         log_entry = f"[{timestamp}] {message}\n"
         
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            self._log_fp.write(log_entry)
             print(log_entry.strip())  # Also print to console for debugging
         except Exception as e:
             print(f"Failed to write to log: {e}")
 
     def sign_msg(self, message):
-        with open(self.private_key_path, "rb") as f:
-            key = serialization.load_pem_private_key(f.read(), password=None)
-        signature = key.sign(
-            message.encode('utf-8'),
-            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-            hashes.SHA256()
-        )
+        signature = sign_message(self._priv_key, message.encode('utf-8'))
         return base64.b64encode(signature).decode('utf-8')
 
     def get_headers(self, method, path):
-        ts = str(int(time.time() * 1000))
+        ts = str(time.time_ns() // 1_000_000)
         return {
             "KALSHI-ACCESS-KEY": self.api_key_id,
             "KALSHI-ACCESS-SIGNATURE": self.sign_msg(ts + method + path),
@@ -68,25 +81,28 @@ class KalshiManTargetSnipeBot:
 
     def get_active_markets(self):
         path = "/trade-api/v2/markets?status=open&limit=5&order_by=closing"
-        res = requests.get(self.base_url + path, headers=self.get_headers("GET", path))
+        try:
+            res = SESSION.get(self.base_url + path, headers=self.get_headers("GET", path), timeout=5)
+        except requests.RequestException as e:
+            # A slow or failed poll skips this tick instead of ending the bot
+            self.log_message(f"Market poll failed: {e}")
+            return []
         if res.status_code == 200:
-            return res.json().get('markets', [])
+            return parse_json(res.content).get('markets', [])
         return []
 
-    def monitor_and_execute(self, ticker):
-        path = f"/trade-api/v2/markets/{ticker}/orderbook"
-        res = requests.get(self.base_url + path, headers=self.get_headers("GET", path))
-        
-        if res.status_code == 200:
-            ob = res.json().get('orderbook', {})
-            # 'yes' is the list of people wanting to SELL Yes contracts to you
-            yes_asks = ob.get('yes', []) 
-            
-            if not yes_asks:
-                return
-
+    def evaluate_markets(self, markets):
+        # The /markets listing already carries each market's best Yes ask,
+        # so one request per tick covers every market without orderbook calls
+        for m in markets:
+            if not self.running:
+                break
+            ticker = m['ticker']
             # The price we actually pay to buy RIGHT NOW
-            current_ask_price = yes_asks[0][0] 
+            current_ask_price = m.get('yes_ask') or 0
+
+            if not current_ask_price:
+                continue
 
             if ticker in self.active_positions:
                 # Stop Loss Check
@@ -103,14 +119,31 @@ class KalshiManTargetSnipeBot:
                     if self.place_order(ticker, "buy", 5):
                         self.active_positions[ticker] = current_ask_price
 
+    def prepare_order_headers(self):
+        # The order signature covers only ts+POST+path, so it can be made
+        # before the market data arrives instead of when a trade fires
+        self._order_headers = (time.monotonic(), self.get_headers("POST", self._order_path))
+
     def place_order(self, ticker, action, count):
-        path = "/trade-api/v2/portfolio/orders"
-        payload = {
-            "ticker": ticker, "action": action, 
-            "type": "market", "side": "yes", "count": count, 
-            "client_order_id": str(uuid.uuid4())
-        }
-        res = requests.post(self.base_url + path, json=payload, headers=self.get_headers("POST", path))
+        payload = self._order_base.copy()
+        payload["ticker"] = ticker
+        payload["action"] = action
+        payload["count"] = count
+        order_id = payload["client_order_id"] = str(uuid.uuid4())
+        body = dump_json(payload)
+        signed_at, headers = self._order_headers
+        presigned = time.monotonic() - signed_at < ORDER_HEADER_TTL
+        if not presigned:
+            headers = self.get_headers("POST", self._order_path)
+        try:
+            res = SESSION.post(self._order_url, data=body, headers=headers, timeout=5)
+            if res.status_code == 401 and presigned:
+                # Stale signature; the same client_order_id makes the resend safe
+                res = SESSION.post(self._order_url, data=body, headers=self.get_headers("POST", self._order_path), timeout=5)
+        except requests.RequestException as e:
+            # The order may still have filled; the id lets it be matched up on Kalshi
+            self.log_message(f"❌ {action.upper()} {ticker} unconfirmed (client_order_id={order_id}): {e}")
+            return False
         if res.status_code == 201:
             self.log_message(f"✅ {action.upper()} order successful.")
             return True
@@ -120,8 +153,8 @@ class KalshiManTargetSnipeBot:
     def save_state(self, state_data):
         """Save bot state to file."""
         try:
-            with open(self.state_file, "w") as f:
-                json.dump(state_data, f, indent=2)
+            with open(self.state_file, "wb") as f:
+                f.write(dump_json(state_data, indent=True))
         except Exception as e:
             self.log_message(f"Failed to save state: {e}")
     
@@ -132,12 +165,10 @@ class KalshiManTargetSnipeBot:
         
         try:
             while self.running:
-                markets = self.get_active_markets()
-                for m in markets:
-                    if not self.running:
-                        break
-                    self.monitor_and_execute(m['ticker'])
-                time.sleep(0.5) # Faster polling
+                self.prepare_order_headers()
+                self.evaluate_markets(self.get_active_markets())
+                self._log_fp.flush()
+                time.sleep(POLL_INTERVAL) # Faster polling
         except KeyboardInterrupt:
             pass
         finally:
@@ -147,6 +178,7 @@ class KalshiManTargetSnipeBot:
                 "active_positions": self.active_positions
             })
             self.log_message("Kalshi Manual Target Sniper Bot stopped")
+            self._log_fp.close()
 
 if __name__ == "__main__":
     bot = KalshiManTargetSnipeBot()
@@ -3,11 +3,9 @@ import sys
 import time
 import math
 import signal
-import json
-import requests
 from dotenv import load_dotenv
 from datetime import datetime
-from kalshi_connection import get_kalshi_headers
+from kalshi_connection import SESSION, dump_json, get_kalshi_headers, parse_balance, parse_json
 
 load_dotenv()
 
@@ -17,6 +15,7 @@ class KalshiPairsBot:
     def __init__(self):
         self.running = True
         self.log_file = "pairs_bot.log"
+        self._log_fp = open(self.log_file, "a", buffering=1 << 14, encoding="utf-8")
         self.state_file = "pairs_state.json"
         
         # Set up signal handlers for graceful shutdown
@@ -26,6 +25,11 @@ class KalshiPairsBot:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
         self.log_message(f"Received signal {signum}, shutting down...")
+        # Written now: the parent may kill the bot before the loop's next flush
+        try:
+            self._log_fp.flush()
+        except (OSError, RuntimeError):  # e.g. the signal landed mid-write
+            pass
         self.running = False
         
     def log_message(self, message: str):
@@ -34,8 +38,7 @@ class KalshiPairsBot:
         log_entry = f"[{timestamp}] {message}\n"
         
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            self._log_fp.write(log_entry)
             print(log_entry.strip())  # Also print to console for debugging
         except Exception as e:
             print(f"Failed to write to log: {e}")
@@ -82,9 +85,9 @@ class KalshiPairsBot:
             b_path = "/trade-api/v2/portfolio/balance"
             base_url = os.getenv("KALSHI_BASE_URL", "https://api.elections.kalshi.com")
             url = base_url + b_path
-            res = requests.get(url, headers=get_kalshi_headers("GET", b_path))
+            res = SESSION.get(url, headers=get_kalshi_headers("GET", b_path), timeout=10)
             if res.status_code == 200:
-                balance = res.json().get('balance', 0) / 100
+                balance = parse_balance(res.content)
                 return balance
         except Exception as e:
             self.log_message(f"Error checking balance: {e}")
@@ -94,9 +97,9 @@ class KalshiPairsBot:
         """Get yes/no prices for a market."""
         try:
             url = f"https://api.elections.kalshi.com/trade-api/v2/markets/{ticker}"
-            res = requests.get(url, headers=get_kalshi_headers("GET", f"/trade-api/v2/markets/{ticker}"))
+            res = SESSION.get(url, headers=get_kalshi_headers("GET", f"/trade-api/v2/markets/{ticker}"), timeout=10)
             if res.status_code == 200:
-                market = res.json().get('market', {})
+                market = parse_json(res.content).get('market', {})
                 yes_price = market.get('yes_ask', 0) / 100  # Convert from cents to dollars
                 no_price = market.get('no_ask', 0) / 100
                 return yes_price, no_price
@@ -150,8 +153,8 @@ class KalshiPairsBot:
     def save_state(self, state_data):
         """Save bot state to file."""
         try:
-            with open(self.state_file, "w") as f:
-                json.dump(state_data, f, indent=2)
+            with open(self.state_file, "wb") as f:
+                f.write(dump_json(state_data, indent=True))
         except Exception as e:
             self.log_message(f"Failed to save state: {e}")
     
@@ -167,6 +170,7 @@ class KalshiPairsBot:
         while self.running:
             try:
                 self.scan_arbitrage_opportunities()
+                self._log_fp.flush()
                 time.sleep(30)
             except KeyboardInterrupt:
                 break
@@ -175,6 +179,7 @@ class KalshiPairsBot:
                 time.sleep(5)  # Wait before retrying
         
         self.log_message("Kalshi Pairs Arbitrage Bot stopped")
+        self._log_fp.close()
 
 if __name__ == "__main__":
     bot = KalshiPairsBot()
@@ -8,13 +8,11 @@ Opportunity threshold: gap >= 2 cents, ask <= 50 cents
 import os
 import sys
 import time
-import json
 import signal
-import requests
 import uuid
 from datetime import datetime
 from dotenv import load_dotenv
-from kalshi_connection import get_kalshi_headers
+from kalshi_connection import SESSION, dump_json, get_kalshi_headers, parse_balance
 from market_discovery import find_opportunities
 
 load_dotenv()
@@ -32,7 +30,9 @@ SCAN_INTERVAL = int(os.getenv("SCAN_INTERVAL", "10"))                  # seconds
 class KalshiScannerBot:
     def __init__(self):
         self.running = True
-        self.log_file = "KalshiScanner.log"
+        # Separate from KalshiScanner.log, which holds the stdout the Command Center tails
+        self.log_file = "scanner_bot.log"
+        self._log_fp = open(self.log_file, "a", buffering=1 << 14, encoding="utf-8")
         self.state_file = "scanner_state.json"
         self.trades_today = 0
         self.pnl_today = 0.0
@@ -42,6 +42,11 @@ class KalshiScannerBot:
 
     def _signal_handler(self, signum, frame):
         self.log(f"Signal {signum} received — shutting down cleanly.")
+        # Written now: the parent may kill the bot before the loop's next flush
+        try:
+            self._log_fp.flush()
+        except (OSError, RuntimeError):  # e.g. the signal landed mid-write
+            pass
         self.running = False
 
     def log(self, msg: str):
@@ -49,28 +54,27 @@ class KalshiScannerBot:
         line = f"[{ts}] {msg}"
         print(line, flush=True)
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(line + "\n")
+            self._log_fp.write(line + "\n")
         except Exception:
             pass
 
     def save_state(self, data: dict):
         try:
-            with open(self.state_file, "w") as f:
-                json.dump(data, f, indent=2)
+            with open(self.state_file, "wb") as f:
+                f.write(dump_json(data, indent=True))
         except Exception as e:
             self.log(f"State save error: {e}")
 
     def get_balance(self) -> float | None:
         try:
             path = "/trade-api/v2/portfolio/balance"
-            res = requests.get(
+            res = SESSION.get(
                 BASE_URL + path,
                 headers=get_kalshi_headers("GET", path),
                 timeout=5,
             )
             if res.status_code == 200:
-                return res.json().get("balance", 0) / 100
+                return parse_balance(res.content)
         except Exception as e:
             self.log(f"Balance check error: {e}")
         return None
@@ -102,7 +106,7 @@ class KalshiScannerBot:
         try:
             headers = get_kalshi_headers("POST", path)
             headers["Content-Type"] = "application/json"
-            res = requests.post(url, json=payload, headers=headers, timeout=5)
+            res = SESSION.post(url, data=dump_json(payload), headers=headers, timeout=5)
             if res.status_code == 201:
                 cost = (ask_cents * count) / 100
                 self.log(f"✅ ORDER PLACED | {ticker} | {side.upper()} x{count} @ {ask_cents}¢ | cost=${cost:.2f}")
@@ -179,12 +183,14 @@ class KalshiScannerBot:
                 self.scan()
             except Exception as e:
                 self.log(f"Scan error: {e}")
+            self._log_fp.flush()
             for _ in range(SCAN_INTERVAL):
                 if not self.running:
                     break
                 time.sleep(1)
 
         self.log("Scanner stopped.")
+        self._log_fp.close()
 
 
 if __name__ == "__main__":
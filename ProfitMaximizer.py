@@ -2,14 +2,12 @@ import os
 import sys
 import time
 import base64
-import requests
 import signal
-import json
 from dotenv import load_dotenv
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from datetime import datetime
-from kalshi_connection import get_kalshi_headers
+from kalshi_connection import SESSION, dump_json, get_kalshi_headers, parse_balance, parse_json
 
 load_dotenv()
 
@@ -19,6 +17,7 @@ class ProfitMaximizerBot:
     def __init__(self):
         self.running = True
         self.log_file = "profit_maximizer_bot.log"
+        self._log_fp = open(self.log_file, "a", buffering=1 << 14, encoding="utf-8")
         self.state_file = "profit_maximizer_state.json"
         
         # Set up signal handlers for graceful shutdown
@@ -28,6 +27,11 @@ class ProfitMaximizerBot:
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully."""
         self.log_message(f"Received signal {signum}, shutting down...")
+        # Written now: the parent may kill the bot before the loop's next flush
+        try:
+            self._log_fp.flush()
+        except (OSError, RuntimeError):  # e.g. the signal landed mid-write
+            pass
         self.running = False
         
     def log_message(self, message: str):
@@ -36,8 +40,7 @@ class ProfitMaximizerBot:
         log_entry = f"[{timestamp}] {message}\n"
         
         try:
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(log_entry)
+            self._log_fp.write(log_entry)
             print(log_entry.strip())  # Also print to console for debugging
         except Exception as e:
             print(f"Failed to write to log: {e}")
@@ -48,9 +51,9 @@ class ProfitMaximizerBot:
             b_path = "/trade-api/v2/portfolio/balance"
             base_url = os.getenv("KALSHI_BASE_URL", "https://api.elections.kalshi.com")
             url = base_url + b_path
-            res = requests.get(url, headers=get_kalshi_headers("GET", b_path))
+            res = SESSION.get(url, headers=get_kalshi_headers("GET", b_path), timeout=10)
             if res.status_code == 200:
-                balance = res.json().get('balance', 0) / 100
+                balance = parse_balance(res.content)
                 return balance
         except Exception as e:
             self.log_message(f"Error checking balance: {e}")
@@ -60,9 +63,9 @@ class ProfitMaximizerBot:
         """Get market data for a specific ticker."""
         try:
             url = f"https://api.elections.kalshi.com/trade-api/v2/markets/{ticker}"
-            res = requests.get(url, headers=get_kalshi_headers("GET", f"/trade-api/v2/markets/{ticker}"))
+            res = SESSION.get(url, headers=get_kalshi_headers("GET", f"/trade-api/v2/markets/{ticker}"), timeout=10)
             if res.status_code == 200:
-                return res.json().get('market', {})
+                return parse_json(res.content).get('market', {})
         except Exception as e:
             self.log_message(f"Error getting market data for {ticker}: {e}")
         return None
@@ -144,8 +147,8 @@ class ProfitMaximizerBot:
     def save_state(self, state_data):
         """Save bot state to file."""
         try:
-            with open(self.state_file, "w") as f:
-                json.dump(state_data, f, indent=2)
+            with open(self.state_file, "wb") as f:
+                f.write(dump_json(state_data, indent=True))
         except Exception as e:
             self.log_message(f"Failed to save state: {e}")
     
@@ -162,6 +165,7 @@ class ProfitMaximizerBot:
         while self.running:
             try:
                 self.scan_high_profit_opportunities()
+                self._log_fp.flush()
                 time.sleep(5)
             except KeyboardInterrupt:
                 break
@@ -170,6 +174,7 @@ class ProfitMaximizerBot:
                 time.sleep(5)  # Wait before retrying
         
         self.log_message("Profit Maximizer Bot stopped")
+        self._log_fp.close()
 
 if __name__ == "__main__":
     bot = ProfitMaximizerBot()
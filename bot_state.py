@@ -14,8 +14,11 @@ def load_state() -> Dict[str, bool]:
         return {}
 
 def save_state(state: Dict[str, bool]) -> None:
+    # Write to a temp file and swap it in so a crash never leaves a torn file
+    tmp_file = STATE_FILE + ".tmp"
     try:
-        with open(STATE_FILE, "w", encoding="utf-8") as f:
+        with open(tmp_file, "w", encoding="utf-8") as f:
             json.dump(state, f, indent=2)
+        os.replace(tmp_file, STATE_FILE)
     except Exception:
         pass
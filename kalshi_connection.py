@@ -1,36 +1,144 @@
 import os
+import json
 import time
 import base64
+import socket
 import requests
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, padding
+
+try:
+    import orjson
+except ImportError:  # optional speedup; the stdlib parser works too
+    orjson = None
 
 load_dotenv()
 
 BASE_URL = os.getenv("KALSHI_BASE_URL", "https://api.elections.kalshi.com")
 
 
-def get_kalshi_headers_api(method: str, path: str, api_key: str, key_path: str) -> dict:
-    """Build Kalshi auth headers using API key."""
+class NoDelayAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets have Nagle disabled and TCP keepalive enabled."""
+
+    # urllib3's defaults already include TCP_NODELAY; keepalive stops idle pooled
+    # connections from being dropped silently between polls
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault("socket_options", self.socket_options)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def make_session(pool_connections: int = 32, pool_maxsize: int = 32) -> requests.Session:
+    """Build a keep-alive Session so repeated polls reuse one TCP/TLS connection."""
+    session = requests.Session()
+    adapter = NoDelayAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        # Retry gateway errors too; only idempotent methods are retried, so orders aren't resent
+        max_retries=Retry(
+            total=3, backoff_factor=0.2,
+            status_forcelist=(502, 503, 504), raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared by every caller in the process
+SESSION = make_session()
+
+
+def parse_json(content: bytes):
+    """Parse a response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dump_json(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+def parse_balance(content: bytes) -> float:
+    """Return the dollar balance from a /portfolio/balance response body."""
+    return parse_json(content).get("balance", 0) / 100
+
+
+@lru_cache(maxsize=None)
+def load_private_key(key_path: str):
+    """Load a PEM private key once per process; later calls reuse the parsed key."""
     with open(key_path, "rb") as f:
-        p_key = serialization.load_pem_private_key(f.read(), password=None)
+        return serialization.load_pem_private_key(f.read(), password=None)
 
-    ts = str(int(time.time() * 1000))
+
+# Immutable, so built once instead of on every signature
+PSS_PADDING = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH)
+SHA256 = hashes.SHA256()
+
+
+def sign_message(p_key, msg: bytes) -> bytes:
+    """Sign with Ed25519 when the key is Ed25519 (much cheaper), else RSA-PSS/SHA256."""
+    if isinstance(p_key, ed25519.Ed25519PrivateKey):
+        return p_key.sign(msg)
+    return p_key.sign(msg, PSS_PADDING, SHA256)
+
+
+@lru_cache(maxsize=64)
+def sign_request(key_path: str, ts: str, method: str, path: str) -> str:
+    """Sign ts+method+path with the key at key_path.
+
+    Memoized so a burst of identical requests within the same millisecond
+    shares one signature instead of paying for a private-key op each.
+    """
     msg = ts + method + path
-    sig = base64.b64encode(
-        p_key.sign(
-            msg.encode(),
-            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-            hashes.SHA256(),
-        )
-    ).decode()
-
-    return {
+    return base64.b64encode(sign_message(load_private_key(key_path), msg.encode())).decode()
+
+
+# Signed headers are reused for this long, well inside Kalshi's timestamp window
+HEADER_TTL = 3.0
+# Only GETs on these fixed paths are cached, so orders and per-ticker paths
+# are always freshly signed and the cache holds at most one entry per path/key
+CACHED_HEADER_PATHS = frozenset({"/trade-api/v2/portfolio/balance"})
+_header_cache: dict = {}
+
+
+def get_kalshi_headers_api(method: str, path: str, api_key: str, key_path: str) -> dict:
+    """Build Kalshi auth headers using API key.
+
+    GET headers for a path in CACHED_HEADER_PATHS are reused for HEADER_TTL
+    seconds. The regular 10s balance polls always re-sign; the cache only
+    saves the private-key op for bursts, e.g. a manual refresh right after a poll.
+    """
+    now_ms = time.time_ns() // 1_000_000
+    cacheable = method == "GET" and path in CACHED_HEADER_PATHS
+    if cacheable:
+        cache_key = (path, api_key, key_path)
+        cached = _header_cache.get(cache_key)
+        if cached is not None and now_ms - cached[1] < HEADER_TTL * 1000:
+            return dict(cached[0])
+
+    ts = str(now_ms)
+    sig = sign_request(key_path, ts, method, path)
+
+    headers = {
         "KALSHI-ACCESS-KEY": api_key,
         "KALSHI-ACCESS-SIGNATURE": sig,
         "KALSHI-ACCESS-TIMESTAMP": ts,
     }
+    if cacheable:
+        _header_cache[cache_key] = (headers, now_ms)
+    return dict(headers)
 
 
 def get_kalshi_headers(method: str, path: str, account: int = 1) -> dict:
@@ -80,7 +188,7 @@ def place_order(ticker: str, side: str, price_cents: int, count: int = 1,
     base_url = os.getenv("KALSHI_BASE_URL", "https://api.elections.kalshi.com")
     
     try:
-        res = requests.post(base_url + path, json=payload, headers=headers, timeout=10)
+        res = requests.post(base_url + path, data=dump_json(payload), headers=headers, timeout=10)
         return res.status_code == 201, res.text
     except Exception as e:
         return False, str(e)
@@ -95,7 +203,7 @@ def get_balance(account: int = 1) -> float:
         headers = get_kalshi_headers("GET", path, account)
         res = requests.get(base_url + path, headers=headers, timeout=10)
         if res.status_code == 200:
-            return res.json().get("balance", 0) / 100
+            return parse_balance(res.content)
     except:
         pass
     return None
@@ -111,8 +219,7 @@ def get_balance(account: int = 1) -> float:
         res = requests.get(base_url + path, headers=headers, timeout=10)
         
         if res.status_code == 200:
-            balance = res.json().get("balance", 0)
-            return balance / 100  # Convert cents to dollars
+            return parse_balance(res.content)
         else:
             return None
     except Exception as e:
@@ -170,7 +277,6 @@ def test_connection(timeout: int = 5) -> dict:
 
 
 if __name__ == "__main__":
-    import json
     import sys
 
     result = test_connection()
@@ -188,18 +294,11 @@ def build_signature_debug(method: str, path: str) -> dict:
     if not api_key or not key_path:
         raise RuntimeError("Missing KALSHI_API_KEY_ID or KALSHI_PRIVATE_KEY_PATH in environment")
 
-    with open(key_path, "rb") as f:
-        p_key = serialization.load_pem_private_key(f.read(), password=None)
+    p_key = load_private_key(key_path)
 
-    ts = str(int(time.time() * 1000))
+    ts = str(time.time_ns() // 1_000_000)
     msg = ts + method + path
-    sig = base64.b64encode(
-        p_key.sign(
-            msg.encode(),
-            padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-            hashes.SHA256(),
-        )
-    ).decode()
+    sig = base64.b64encode(sign_message(p_key, msg.encode())).decode()
 
     return {"timestamp": ts, "message": msg, "signature": sig, "api_key": api_key}
 
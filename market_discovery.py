@@ -3,9 +3,9 @@ market_discovery.py - Dynamic Kalshi market discovery.
 Finds live KXETH15M, KXBTC15M, and hourly crypto range markets.
 """
 import os
-import requests
 from datetime import datetime, timezone
-from kalshi_connection import get_kalshi_headers
+from operator import itemgetter
+from kalshi_connection import SESSION, get_kalshi_headers, parse_json
 
 BASE_URL = os.getenv("KALSHI_BASE_URL", "https://api.elections.kalshi.com")
 
@@ -20,13 +20,13 @@ def get_live_15m_markets() -> list[dict]:
     for series in SERIES_15M:
         path = f"/trade-api/v2/markets?status=open&series_ticker={series}&limit=20"
         try:
-            res = requests.get(
+            res = SESSION.get(
                 BASE_URL + path,
                 headers=get_kalshi_headers("GET", path),
                 timeout=5,
             )
             if res.status_code == 200:
-                batch = res.json().get("markets", [])
+                batch = parse_json(res.content).get("markets", [])
                 for m in batch:
                     m["_series"] = series
                 markets.extend(batch)
@@ -41,13 +41,13 @@ def get_live_hourly_markets(min_volume: int = 10) -> list[dict]:
     for series in SERIES_HOURLY:
         path = f"/trade-api/v2/markets?status=open&series_ticker={series}&limit=200"
         try:
-            res = requests.get(
+            res = SESSION.get(
                 BASE_URL + path,
                 headers=get_kalshi_headers("GET", path),
                 timeout=5,
             )
             if res.status_code == 200:
-                batch = res.json().get("markets", [])
+                batch = parse_json(res.content).get("markets", [])
                 for m in batch:
                     m["_series"] = series
                 # Filter for markets with some liquidity
@@ -58,36 +58,45 @@ def get_live_hourly_markets(min_volume: int = 10) -> list[dict]:
     return markets
 
 
-def score_opportunity(market: dict) -> dict:
+def score_prices(market: dict) -> dict:
     """
-    Calculate the gap and opportunity score for a market.
+    Enrich a market with its gap and cheapest side (no time fields).
     Gap = 100 - (yes_bid + no_bid)  → how many cents are 'free'
-    Returns enriched market dict with gap/score fields.
     """
     yes_bid = market.get("yes_bid", 0)
     no_bid = market.get("no_bid", 0)
     yes_ask = market.get("yes_ask", 0)
     no_ask = market.get("no_ask", 0)
-    gap = 100 - (yes_bid + no_bid)
 
     # Best entry: buy whichever side has the lower ask
     # We want to pay less than 50¢ for a $1 payout
     best_side = "yes" if yes_ask <= no_ask else "no"
-    best_ask = yes_ask if best_side == "yes" else no_ask
 
+    market["_gap"] = 100 - (yes_bid + no_bid)
+    market["_best_side"] = best_side
+    market["_best_ask"] = yes_ask if best_side == "yes" else no_ask
+    return market
+
+
+def minutes_left(market: dict, now: datetime) -> int | None:
+    """Whole minutes until the market closes, or None if close_time is missing/bad."""
     close_time = market.get("close_time", "")
-    mins_left = None
     if close_time:
         try:
             ct = datetime.fromisoformat(close_time.replace("Z", "+00:00"))
-            mins_left = max(0, int((ct - datetime.now(timezone.utc)).total_seconds() / 60))
+            return max(0, int((ct - now).total_seconds() / 60))
         except Exception:
             pass
+    return None
 
-    market["_gap"] = gap
-    market["_best_side"] = best_side
-    market["_best_ask"] = best_ask
-    market["_mins_left"] = mins_left
+
+def score_opportunity(market: dict) -> dict:
+    """
+    Calculate the gap and opportunity score for a market.
+    Returns enriched market dict with gap/score fields.
+    """
+    score_prices(market)
+    market["_mins_left"] = minutes_left(market, datetime.now(timezone.utc))
     return market
 
 
@@ -97,13 +106,15 @@ def find_opportunities(min_gap: int = 2, max_ask: int = 50) -> list[dict]:
     and best_ask <= max_ask (so we're buying the cheap side).
     Sorted by gap descending.
     """
-    all_markets = get_live_15m_markets() + get_live_hourly_markets()
-    scored = [score_opportunity(m) for m in all_markets]
-    opps = [
-        m for m in scored
-        if m["_gap"] >= min_gap and m["_best_ask"] <= max_ask
-    ]
-    opps.sort(key=lambda m: m["_gap"], reverse=True)
+    now = datetime.now(timezone.utc)
+    opps = []
+    for m in get_live_15m_markets() + get_live_hourly_markets():
+        score_prices(m)
+        # Only parse close_time for markets that survive the price filter
+        if m["_gap"] >= min_gap and m["_best_ask"] <= max_ask:
+            m["_mins_left"] = minutes_left(m, now)
+            opps.append(m)
+    opps.sort(key=itemgetter("_gap"), reverse=True)
     return opps
 
 
@@ -148,9 +148,16 @@ def get_recent_log():
     """Get last 10 lines of profit_bot.log"""
     try:
         if os.path.exists(SCANNER_LOG):
-            with open(SCANNER_LOG, "r") as f:
-                lines = f.readlines()
-                return "".join(lines[-10:]).strip()
+            with open(SCANNER_LOG, "rb") as f:
+                # Only the last 4 KB: enough for 10 lines without reading the whole log
+                f.seek(0, os.SEEK_END)
+                start = max(0, f.tell() - 4096)
+                f.seek(start)
+                lines = f.read().decode("utf-8", errors="replace").splitlines()
+                if start > 0:
+                    # The window usually begins mid-line; drop that fragment
+                    lines = lines[1:]
+                return "\n".join(lines[-10:]).strip()
     except:
         pass
     return "(no log)"
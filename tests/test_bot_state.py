@@ -1,23 +1,25 @@
 import os
+import pytest
+import bot_state
 from bot_state import save_state, load_state
 
-TEST_FILE = os.path.join(os.getcwd(), "bots_state.json")
 
-def test_save_and_load():
-    # ensure clean
-    try:
-        if os.path.exists(TEST_FILE):
-            os.remove(TEST_FILE)
-    except Exception:
-        pass
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    # Keep tests away from the real bots_state.json in the working directory
+    path = str(tmp_path / "bots_state.json")
+    monkeypatch.setattr(bot_state, "STATE_FILE", path)
+    return path
 
+
+def test_save_and_load(state_file):
     st = {"scanner": True, "credit_spread": False}
     save_state(st)
     loaded = load_state()
     assert loaded == st
 
-    # cleanup
-    try:
-        os.remove(TEST_FILE)
-    except Exception:
-        pass
+
+def test_save_state_leaves_no_temp_file(state_file):
+    save_state({"scanner": True})
+    assert not os.path.exists(state_file + ".tmp")
+    assert load_state() == {"scanner": True}
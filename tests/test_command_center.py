@@ -0,0 +1,39 @@
+import asyncio
+from KalshiCommandCenter import KalshiCommandCenter
+
+
+class CountingEvent(asyncio.Event):
+    """asyncio.Event that counts wait() calls, i.e. poller loop iterations."""
+
+    def __init__(self):
+        super().__init__()
+        self.waits = 0
+
+    async def wait(self):
+        self.waits += 1
+        return await super().wait()
+
+
+def test_minimal_poller_sleeps_between_balance_syncs():
+    app = KalshiCommandCenter(minimal=True)
+    syncs = []
+
+    async def fake_sync_balance():
+        syncs.append(1)
+        return True
+
+    app._sync_balance = fake_sync_balance
+
+    async def run_poller():
+        app._poll_now = CountingEvent()
+        task = asyncio.create_task(app._poller())
+        await asyncio.sleep(0.3)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run_poller())
+    assert syncs == [1]
+    assert app._poll_now.waits == 1
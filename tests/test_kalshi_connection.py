@@ -1,4 +1,9 @@
-from kalshi_connection import build_signature_debug
+import os
+import socket
+import kalshi_connection
+from kalshi_connection import (
+    SESSION, build_signature_debug, dump_json, get_kalshi_headers, load_private_key, parse_balance, parse_json, sign_message, sign_request,
+)
 
 
 def test_build_signature_debug_structure():
@@ -8,3 +13,61 @@ def test_build_signature_debug_structure():
     assert "signature" in dbg
     assert "api_key" in dbg
     assert dbg["message"].endswith("/trade-api/v2/portfolio/balance")
+
+
+def test_load_private_key_is_cached():
+    key_path = os.getenv("KALSHI_PRIVATE_KEY_PATH")
+    assert load_private_key(key_path) is load_private_key(key_path)
+
+
+def test_sign_request_reuses_signature_for_same_timestamp():
+    # PSS signatures are randomized, so equality means the second call was cached
+    key_path = os.getenv("KALSHI_PRIVATE_KEY_PATH")
+    first = sign_request(key_path, "1700000000000", "GET", "/trade-api/v2/portfolio/balance")
+    second = sign_request(key_path, "1700000000000", "GET", "/trade-api/v2/portfolio/balance")
+    assert first == second
+
+
+def test_parse_json_reads_response_bytes():
+    assert parse_json(b'{"balance": 12345}') == {"balance": 12345}
+
+
+def test_parse_balance_converts_cents_to_dollars():
+    assert parse_balance(b'{"balance": 12345, "portfolio_value": 0}') == 123.45
+
+
+def test_dump_json_round_trips_through_parse_json():
+    state = {"ticker": "KXETH15M", "count": 5, "positions": {"A": 61}}
+    assert parse_json(dump_json(state)) == state
+    assert parse_json(dump_json(state, indent=True)) == state
+
+
+def test_sign_message_uses_ed25519_keys_directly():
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+
+    key = ed25519.Ed25519PrivateKey.generate()
+    sig = sign_message(key, b"1700000000000GET/trade-api/v2/portfolio/balance")
+    key.public_key().verify(sig, b"1700000000000GET/trade-api/v2/portfolio/balance")
+
+
+def test_get_kalshi_headers_reuses_recent_signature():
+    first = get_kalshi_headers("GET", "/trade-api/v2/portfolio/balance")
+    first["Content-Type"] = "application/json"
+    second = get_kalshi_headers("GET", "/trade-api/v2/portfolio/balance")
+    assert second["KALSHI-ACCESS-SIGNATURE"] == first["KALSHI-ACCESS-SIGNATURE"]
+    # Callers get their own copy, so mutations don't leak into the cache
+    assert "Content-Type" not in second
+
+
+def test_get_kalshi_headers_only_caches_fixed_gets():
+    get_kalshi_headers("POST", "/trade-api/v2/portfolio/orders")
+    get_kalshi_headers("GET", "/trade-api/v2/markets/KXETH15M-26FEB191215")
+    cached_paths = {key[0] for key in kalshi_connection._header_cache}
+    assert cached_paths <= kalshi_connection.CACHED_HEADER_PATHS
+
+
+def test_session_sockets_disable_nagle():
+    adapter = SESSION.get_adapter("https://api.elections.kalshi.com")
+    options = adapter.poolmanager.connection_pool_kw["socket_options"]
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options